@@ -5,14 +5,12 @@ import json
 import os
 import re
 import sys
-from collections import deque
 from collections.abc import Container, Hashable, Iterable, MutableSet
 from collections.abc import Set as AbstractSet
-from configparser import ConfigParser, SectionProxy
+from configparser import ConfigParser
+from contextlib import suppress
 from enum import Enum, auto
-from glob import iglob
-from importlib.metadata import Distribution, PackageNotFoundError
-from importlib.metadata import distribution as _get_distribution
+from importlib.metadata import Distribution
 from importlib.metadata import distributions as _get_distributions
 from itertools import chain
 from pathlib import Path
@@ -24,17 +22,21 @@ from typing import (
     Any,
     Callable,
     TypedDict,
-    cast,
 )
 from warnings import warn
 
 import tomli
 from jsonpointer import resolve_pointer  # type: ignore
+from packaging.markers import Marker
 from packaging.requirements import InvalidRequirement, Requirement
 from packaging.utils import canonicalize_name
 
 _BUILTIN_DISTRIBUTION_NAMES: tuple[str] = ("distribute",)
 _UNSAFE_CHARACTERS_PATTERN: re.Pattern = re.compile("[^A-Za-z0-9.]+")
+_REQUIREMENT_FILE_COMMENT_PATTERN: re.Pattern = re.compile(r"(^|\s)#.*$")
+_OPTION_REQUIREMENT_LINE_PATTERN: re.Pattern = re.compile(
+    r"^[ \t]*([^\s#-].*?)[ \t]*$", re.MULTILINE
+)
 
 
 def iter_distinct(items: Iterable[Hashable]) -> Iterable:
@@ -60,7 +62,7 @@ def get_exception_text() -> str:
 
 
 def _iter_parse_delimited_value(value: str, delimiter: str) -> Iterable[str]:
-    return value.split(delimiter)
+    return filter(None, map(str.strip, value.split(delimiter)))
 
 
 def iter_parse_delimited_values(
@@ -70,6 +72,8 @@ def iter_parse_delimited_values(
     This function iterates over input values which have been provided as a
     list or iterable and/or a single string of character-delimited values.
     A typical use-case is parsing multi-value command-line arguments.
+    Surrounding whitespace is stripped from each value, and empty values
+    are skipped.
     """
     if isinstance(values, str):
         values = (values,)
@@ -77,7 +81,7 @@ def iter_parse_delimited_values(
     def iter_parse_delimited_value_(value: str) -> Iterable[str]:
         return _iter_parse_delimited_value(value, delimiter=delimiter)
 
-    return chain(*map(iter_parse_delimited_value_, values))
+    return chain.from_iterable(map(iter_parse_delimited_value_, values))
 
 
 def check_output(
@@ -276,11 +280,15 @@ def iter_find_qualified_lists(
             yield data
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """
-    Normalize a project/distribution name
+    Normalize a project/distribution name (results are memoized, as the
+    same names are normalized repeatedly while traversing requirements)
     """
-    return _UNSAFE_CHARACTERS_PATTERN.sub("-", canonicalize_name(name)).lower()
+    # Note: `canonicalize_name` lower-cases the name, so it does not need to
+    # be lower-cased again
+    return _UNSAFE_CHARACTERS_PATTERN.sub("-", canonicalize_name(name))
 
 
 class ConfigurationFileType(Enum):
@@ -291,10 +299,14 @@ class ConfigurationFileType(Enum):
     TOML = auto()
 
 
-@functools.lru_cache
-def get_configuration_file_type(path: str) -> ConfigurationFileType:
-    if not os.path.isfile(path):
-        raise FileNotFoundError(path)
+def _get_path_configuration_file_type(
+    path: str,
+) -> ConfigurationFileType | None:
+    """
+    Infer the type of configuration file from a path's base name alone
+    (without accessing the file system), or return `None` if the name is
+    not that of a recognized type of configuration file.
+    """
     basename: str = os.path.basename(path).lower()
     if basename == "setup.cfg":
         return ConfigurationFileType.SETUP_CFG
@@ -306,16 +318,30 @@ def get_configuration_file_type(path: str) -> ConfigurationFileType:
         return ConfigurationFileType.REQUIREMENTS_TXT
     if basename.endswith(".toml"):
         return ConfigurationFileType.TOML
-    message: str = f"{path} is not a recognized type of configuration file."
-    raise ValueError(message)
+    return None
+
+
+@functools.lru_cache
+def get_configuration_file_type(path: str) -> ConfigurationFileType:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    configuration_file_type: ConfigurationFileType | None = (
+        _get_path_configuration_file_type(path)
+    )
+    if configuration_file_type is None:
+        message: str = (
+            f"{path} is not a recognized type of configuration file."
+        )
+        raise ValueError(message)
+    return configuration_file_type
 
 
 def is_configuration_file(path: str) -> bool:
-    try:
-        get_configuration_file_type(path)
-    except (FileNotFoundError, ValueError):
-        return False
-    return True
+    # Only access the file system for recognized file names, since most
+    # arguments will be requirement strings
+    return (_get_path_configuration_file_type(path) is not None) and (
+        os.path.isfile(path)
+    )
 
 
 class _EditablePackageMetadata(TypedDict):
@@ -362,16 +388,58 @@ def cache_clear() -> None:
     is_editable.cache_clear()
     is_installed.cache_clear()
     get_requirement_string_distribution_name.cache_clear()
+    _get_required_distribution_names.cache_clear()
+    _get_configuration_file_requirement_strings.cache_clear()
 
 
 def refresh_editable_distributions() -> None:
     """
     Update distribution information for editable installs
     """
-    name: str
-    location: str
-    for name, location in get_editable_distributions_locations().items():
-        _install_requirement_string(location, name=name, editable=True)
+    editable_distributions_locations: dict[str, str] = (
+        get_editable_distributions_locations()
+    )
+    if not editable_distributions_locations:
+        return
+    # Re-install all editable distributions with a single pip command
+    try:
+        check_output(
+            _get_install_command(
+                editable_distributions_locations.values(), editable=True
+            )
+        )
+    except CalledProcessError:
+        # If this fails, install distributions individually, so that errors
+        # are reported meaningfully
+        name: str
+        location: str
+        for name, location in editable_distributions_locations.items():
+            _install_requirement_string(location, name=name, editable=True)
+
+
+def _get_dist_info_name(distribution: Distribution) -> str | None:
+    """
+    Infer a distribution's name from the name of its *.dist-info directory
+    (formatted as "{name}-{version}.dist-info"), which does not require
+    reading the distribution's metadata. If the distribution was not
+    installed from a wheel, `None` is returned.
+    """
+    directory_name: str = getattr(
+        getattr(distribution, "_path", None), "name", ""
+    )
+    if directory_name.endswith(".dist-info"):
+        stem: str = directory_name[: -len(".dist-info")]
+        name: str
+        separator: str
+        version: str
+        name, separator, version = stem.partition("-")
+        if separator and name and version:
+            return name
+    return None
+
+
+def _get_distribution_name(distribution: Distribution) -> str:
+    return _get_dist_info_name(distribution) or distribution.metadata["Name"]
 
 
 @functools.lru_cache
@@ -380,16 +448,29 @@ def get_installed_distributions() -> dict[str, Distribution]:
     Return a dictionary of installed distributions.
     """
     refresh_editable_distributions()
-    installed: dict[str, Distribution] = {}
-    for distribution in _get_distributions():
-        installed[normalize_name(distribution.metadata["Name"])] = distribution
-    return installed
+    distribution: Distribution
+    return {
+        normalize_name(_get_distribution_name(distribution)): distribution
+        for distribution in _get_distributions()
+    }
 
 
 def get_distribution(name: str) -> Distribution:
     return get_installed_distributions()[normalize_name(name)]
 
 
+def get_distribution_name_version(
+    distribution: Distribution,
+) -> tuple[str, str]:
+    """
+    Return the name and version of a distribution, as specified in its
+    metadata. The metadata is only read once (each access of
+    `Distribution.metadata` or `Distribution.version` re-reads it).
+    """
+    metadata: Any = distribution.metadata
+    return metadata["Name"], metadata["Version"]
+
+
 @functools.lru_cache
 def is_installed(distribution_name: str) -> bool:
     return normalize_name(distribution_name) in get_installed_distributions()
@@ -406,47 +487,112 @@ def get_requirement_string_distribution_name(requirement_string: str) -> str:
     )
 
 
-@functools.lru_cache
-def is_requirement_string(requirement_string: str) -> bool:
+@functools.lru_cache(maxsize=4096)
+def _parse_requirement_string(requirement_string: str) -> Requirement | None:
+    """
+    Parse a requirement string, or return `None` if `requirement_string` is
+    not a valid requirement. Results are memoized, since the same requirement
+    strings are typically validated and parsed several times.
+
+    Note: Because the returned `Requirement` instances are shared, they
+    must not be modified.
+    """
     try:
-        Requirement(requirement_string)
+        return Requirement(requirement_string)
     except InvalidRequirement:
-        return False
-    return True
+        return None
+
+
+def is_requirement_string(requirement_string: str) -> bool:
+    return _parse_requirement_string(requirement_string) is not None
 
 
 def _iter_file_requirement_strings(path: str) -> Iterable[str]:
-    lines: list[str]
+    line: str
     requirement_file_io: IO[str]
     with open(path) as requirement_file_io:
-        lines = requirement_file_io.readlines()
-    return filter(is_requirement_string, lines)
+        for line in requirement_file_io:
+            line = _REQUIREMENT_FILE_COMMENT_PATTERN.sub("", line).strip()
+            # Skip blank lines and options (such as "-r other.txt" or
+            # "-c constraints.txt"), which are not requirement strings
+            if (
+                line
+                and (not line.startswith("-"))
+                and is_requirement_string(line)
+            ):
+                yield line
+
+
+def _get_ini_string_sections(string: str) -> dict[str, dict[str, str]]:
+    """
+    Parse the contents of an INI file into a dictionary mapping section names
+    to a dictionary of each section's (raw, uninterpolated) option values
+    """
+    parser: ConfigParser = ConfigParser(interpolation=None)
+    parser.read_string(string)
+    section_name: str
+    return {
+        section_name: dict(parser[section_name])
+        for section_name in parser.sections()
+    }
+
+
+@functools.lru_cache
+def _read_ini_sections(
+    path: str, modified_time: int, size: int
+) -> dict[str, dict[str, str]]:
+    """
+    Parse an INI file (such as setup.cfg or tox.ini). Results are cached
+    by path, modification time (in nanoseconds) and size, so a file is only
+    re-parsed if it has been modified.
+    """
+    return _get_ini_string_sections(Path(path).read_text(encoding="utf-8"))
+
+
+def _get_ini_sections(path: str) -> dict[str, dict[str, str]]:
+    """
+    Get a dictionary mapping section names to a dictionary of each
+    section's option values for the INI file at `path` (or an empty
+    dictionary if the file does not exist).
+    """
+    stat: os.stat_result
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    return _read_ini_sections(
+        os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+    )
+
+
+def _iter_option_requirement_strings(value: str) -> Iterable[str]:
+    """
+    Yield the requirement strings found in a (multi-line) INI option value,
+    skipping blank lines, comments and options (such as "-r other.txt")
+    """
+    return filter(
+        is_requirement_string, _OPTION_REQUIREMENT_LINE_PATTERN.findall(value)
+    )
 
 
 def _iter_setup_cfg_requirement_strings(path: str) -> Iterable[str]:
-    parser: ConfigParser = ConfigParser()
-    parser.read(path)
+    sections: dict[str, dict[str, str]] = _get_ini_sections(path)
+    options: dict[str, str] = sections.get("options", {})
     requirement_strings: Iterable[str] = ()
-    if ("options" in parser) and ("install_requires" in parser["options"]):
+    if "install_requires" in options:
         requirement_strings = chain(
             requirement_strings,
-            filter(
-                is_requirement_string,
-                parser["options"]["install_requires"].split("\n"),
-            ),
+            _iter_option_requirement_strings(options["install_requires"]),
         )
-    if "options.extras_require" in parser:
-        extras_require: SectionProxy = parser["options.extras_require"]
-        extra_requirements_string: str
-        for extra_requirements_string in extras_require.values():
-            requirement_strings = chain(
-                requirement_strings,
-                filter(
-                    is_requirement_string,
-                    extra_requirements_string.split("\n"),
-                ),
-            )
-    return iter_distinct(requirement_strings)
+    extra_requirements_string: str
+    for extra_requirements_string in sections.get(
+        "options.extras_require", {}
+    ).values():
+        requirement_strings = chain(
+            requirement_strings,
+            _iter_option_requirement_strings(extra_requirements_string),
+        )
+    return requirement_strings
 
 
 def _iter_tox_ini_requirement_strings(
@@ -462,7 +608,7 @@ def _iter_tox_ini_requirement_strings(
     - path (str|Path) = "": The path to a tox.ini file
     - string (str) = "": The contents of a tox.ini file
     """
-    parser: ConfigParser = ConfigParser()
+    sections: dict[str, dict[str, str]]
     message: str
     if path:
         if string:
@@ -471,21 +617,19 @@ def _iter_tox_ini_requirement_strings(
                 "both"
             )
             raise ValueError(message)
-        parser.read(path)
+        sections = _get_ini_sections(str(path))
     else:
         if not string:
             message = "Either a `path` or `string` argument must be provided"
             raise ValueError(message)
-        parser.read_string(string)
+        sections = _get_ini_string_sections(string)
 
     def get_section_option_requirements(
         section_name: str, option_name: str
     ) -> Iterable[str]:
-        if parser.has_option(section_name, option_name):
-            return filter(
-                is_requirement_string,
-                parser.get(section_name, option_name).split("\n"),
-            )
+        options: dict[str, str] = sections[section_name]
+        if option_name in options:
+            return _iter_option_requirement_strings(options[option_name])
         return ()
 
     def get_section_requirements(section_name: str) -> Iterable[str]:
@@ -499,8 +643,8 @@ def _iter_tox_ini_requirement_strings(
             )
         return requirements
 
-    return iter_distinct(
-        chain(("tox",), *map(get_section_requirements, parser.sections()))
+    return chain(
+        ("tox",), chain.from_iterable(map(get_section_requirements, sections))
     )
 
 
@@ -514,9 +658,8 @@ def _is_installed_requirement_string(item: Any) -> bool:
     """
     if not isinstance(item, str):
         return False
-    try:
-        requirement: Requirement = Requirement(item)
-    except InvalidRequirement:
+    requirement: Requirement | None = _parse_requirement_string(item)
+    if requirement is None:
         return False
     return is_installed(requirement.name)
 
@@ -576,6 +719,32 @@ def iter_find_requirements_lists(
         )
 
 
+@functools.lru_cache
+def _read_toml(path: str, modified_time: int, size: int) -> dict[str, Any]:
+    """
+    Parse a TOML file. Results are cached by path, modification time (in
+    nanoseconds) and size, so a file is only re-parsed if it has been
+    modified.
+    """
+    toml_io: IO[bytes]
+    with open(path, "rb") as toml_io:
+        return tomli.load(toml_io)
+
+
+def _get_toml(path: str) -> dict[str, Any]:
+    """
+    Get the parsed contents of the TOML file at `path` (or an empty
+    dictionary if the file does not exist). The returned dictionary is
+    shared between calls, and must not be modified.
+    """
+    stat: os.stat_result
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    return _read_toml(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
 def _iter_toml_requirement_strings(
     path: str,
     include_pointers: tuple[str, ...] = (),
@@ -592,19 +761,13 @@ def _iter_toml_requirement_strings(
             exclude (defaults to no exclusions).
     """
     # Parse pyproject.toml
-    try:
-        with open(path, "rb") as pyproject_io:
-            document: dict[str, Any] = tomli.load(pyproject_io)
-    except FileNotFoundError:
-        return
+    document: dict[str, Any] = _get_toml(path)
     # Find requirements
-    yield from iter_distinct(
-        chain(
-            *iter_find_requirements_lists(
-                document,
-                include_pointers=include_pointers,
-                exclude_pointers=exclude_pointers,
-            )
+    yield from chain.from_iterable(
+        iter_find_requirements_lists(
+            document,
+            include_pointers=include_pointers,
+            exclude_pointers=exclude_pointers,
         )
     )
 
@@ -625,6 +788,49 @@ def iter_configuration_file_requirement_strings(
         exclude_pointers: A tuple of JSON pointers indicating elements to
             exclude (defaults to no exclusions).
     """
+    stat: os.stat_result = os.stat(path)
+    return _get_configuration_file_requirement_strings(
+        os.path.abspath(path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(include_pointers),
+        tuple(exclude_pointers),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _get_configuration_file_requirement_strings(
+    path: str,
+    modified_time: int,
+    size: int,
+    include_pointers: tuple[str, ...],
+    exclude_pointers: tuple[str, ...],
+) -> tuple[str, ...]:
+    """
+    Read a configuration file and return the parsed requirements. Results
+    are cached by path, modification time and size, so a file is only
+    re-read if it has been modified (or if `cache_clear` has been called,
+    since requirements found in TOML files depend on what is installed).
+    Duplicate requirement strings are removed here, once, rather than by
+    each file type's parser.
+    """
+    return tuple(
+        iter_distinct(
+            _iter_configuration_file_requirement_strings(
+                path,
+                include_pointers=include_pointers,
+                exclude_pointers=exclude_pointers,
+            )
+        )
+    )
+
+
+def _iter_configuration_file_requirement_strings(
+    path: str,
+    *,
+    include_pointers: tuple[str, ...] = (),
+    exclude_pointers: tuple[str, ...] = (),
+) -> Iterable[str]:
     configuration_file_type: ConfigurationFileType = (
         get_configuration_file_type(path)
     )
@@ -660,10 +866,9 @@ def _get_setup_cfg_metadata(path: str, key: str) -> str:
             path = os.path.dirname(path)
         path = os.path.join(path, "setup.cfg")
     if os.path.isfile(path):
-        parser: ConfigParser = ConfigParser()
-        parser.read(path)
-        if "metadata" in parser:
-            return parser.get("metadata", key, fallback="")
+        sections: dict[str, dict[str, str]] = _get_ini_sections(path)
+        if "metadata" in sections:
+            return sections["metadata"].get(key, "")
         warn(
             f"No `metadata` section found in: {path}",
             stacklevel=2,
@@ -724,11 +929,9 @@ def _get_pyproject_toml_project_metadata(path: str, key: str) -> str:
             path = os.path.dirname(path)
         path = os.path.join(path, "pyproject.toml")
     if os.path.isfile(path):
-        pyproject_io: IO[str]
-        with open(path) as pyproject_io:
-            pyproject: dict[str, Any] = tomli.loads(pyproject_io.read())
-            if "project" in pyproject:
-                return pyproject["project"].get(key, "")
+        pyproject: dict[str, Any] = _get_toml(path)
+        if "project" in pyproject:
+            return pyproject["project"].get(key, "")
     return ""
 
 
@@ -762,19 +965,37 @@ def _setup(arguments: tuple[str, ...]) -> None:
 
 
 def _setup_location(
-    location: str | Path, arguments: Iterable[tuple[str, ...]]
+    location: str | Path,
+    arguments: Iterable[tuple[str, ...]],
+    *,
+    compatible: bool = False,
 ) -> None:
-    if isinstance(location, str):
-        location = Path(location)
+    """
+    Run one or more setup.py commands in `location`.
+
+    Parameters:
+
+    - location (str|Path): The directory containing a setup.py script
+    - arguments ([(str)]): The arguments for each command
+    - compatible (bool) = False: If `True`, each command is run in a
+      separate subprocess. By default, commands are chained and run
+      using a single subprocess.
+    """
+    location = os.fspath(location)
     # If there is no setup.py file, we can't update egg info
-    if not location.joinpath("setup.py").is_file():
+    if not os.path.isfile(os.path.join(location, "setup.py")):
         return
     if isinstance(arguments, str):
         arguments = (arguments,)
-    current_directory: Path = Path(os.curdir).absolute()
+    current_directory: str = os.path.abspath(os.curdir)
     os.chdir(location)
     try:
-        deque(map(_setup, arguments), maxlen=0)
+        if compatible:
+            arguments_: tuple[str, ...]
+            for arguments_ in arguments:
+                _setup(arguments_)
+        else:
+            _setup(tuple(chain.from_iterable(arguments)))
     finally:
         os.chdir(current_directory)
 
@@ -788,20 +1009,25 @@ def setup_egg_info(directory: str | Path, egg_base: str = "") -> None:
     Refresh egg-info for the editable package installed in
     `directory` (only applicable for packages using a `setup.py` script)
     """
-    if isinstance(directory, str):
-        directory = Path(directory)
-    directory = directory.absolute()
-    if not directory.is_dir():
-        directory = directory.parent
+    directory = os.path.abspath(directory)
+    if not os.path.isdir(directory):
+        directory = os.path.dirname(directory)
     # If there is a setup.py, and a *.dist-info directory, but that
     # *.dist-info directory has no RECORD, we need to remove the *.dist-info
     # directory
-    if directory.joinpath("setup.py").is_file():
-        dist_info: str
-        for dist_info in iglob(str(directory.joinpath("*.dist-info"))):
-            dist_info_path: Path = Path(dist_info)
-            if not dist_info_path.joinpath("RECORD").is_file():
-                rmtree(dist_info_path)
+    if os.path.isfile(os.path.join(directory, "setup.py")):
+        entry: os.DirEntry
+        with os.scandir(directory) as entries:
+            dist_info_paths: list[str] = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".dist-info")
+                and entry.is_dir()
+                and not os.path.isfile(os.path.join(entry.path, "RECORD"))
+            ]
+        dist_info_path: str
+        for dist_info_path in dist_info_paths:
+            rmtree(dist_info_path)
     _setup_location(
         directory,
         (("-q", "egg_info") + (("--egg-base", egg_base) if egg_base else ()),),
@@ -811,23 +1037,25 @@ def setup_egg_info(directory: str | Path, egg_base: str = "") -> None:
 def get_requirement(
     requirement_string: str,
 ) -> Requirement:
-    try:
-        return Requirement(requirement_string)
-    except InvalidRequirement as error:
-        # Try to parse the requirement as an installation target location,
-        # such as can be used with `pip install`
-        location: str = requirement_string
-        extras: str = ""
-        if "[" in requirement_string and requirement_string.endswith("]"):
-            parts: list[str] = requirement_string.split("[")
-            location = "[".join(parts[:-1])
-            extras = f"[{parts[-1]}"
-        location = os.path.abspath(location)
-        name: str = get_setup_distribution_name(location)
-        if not name:
-            message: str = f"No distribution found in {location}"
-            raise FileNotFoundError(message) from error
-        return Requirement(f"{name}{extras}")
+    requirement: Requirement | None = _parse_requirement_string(
+        requirement_string
+    )
+    if requirement is not None:
+        return requirement
+    # Try to parse the requirement as an installation target location,
+    # such as can be used with `pip install`
+    location: str = requirement_string
+    extras: str = ""
+    if "[" in requirement_string and requirement_string.endswith("]"):
+        parts: list[str] = requirement_string.split("[")
+        location = "[".join(parts[:-1])
+        extras = f"[{parts[-1]}"
+    location = os.path.abspath(location)
+    name: str = get_setup_distribution_name(location)
+    if not name:
+        message: str = f"No distribution found in {location}"
+        raise FileNotFoundError(message)
+    return Requirement(f"{name}{extras}")
 
 
 def get_required_distribution_names(
@@ -857,13 +1085,72 @@ def get_required_distribution_names(
       requirements. If `None` (the default), recursion is not restricted.
     """
     if isinstance(exclude, str):
-        exclude = {normalize_name(exclude)}
-    else:
-        exclude = set(map(normalize_name, exclude))
+        exclude = (exclude,)
     return set(
+        _get_required_distribution_names(
+            requirement_string,
+            exclude=frozenset(map(normalize_name, exclude)),
+            recursive=recursive,
+            echo=echo,
+            depth=depth,
+        )
+    )
+
+
+def iter_required_distribution_names(
+    requirement_string: str,
+    *,
+    exclude: Iterable[str] = (),
+    recursive: bool = True,
+    echo: bool = False,
+    depth: int | None = None,
+) -> Iterable[str]:
+    """
+    Yield the (distinct) names of all distributions which are required by
+    the distribution specified in `requirement_string`, as they are
+    discovered. Unlike `get_required_distribution_names`, results are not
+    cached, so this is preferable when names will be consumed only once.
+
+    Parameters:
+
+    - requirement_string (str): A distribution name, or a requirement string
+      indicating both a distribution name and extras.
+    - exclude ([str]): The name of one or more distributions to *exclude*
+      from requirements lookup. Please note that excluding a distribution will
+      also halt recursive lookup of requirements for that distribution.
+    - recursive (bool): If `True` (the default), required distributions will
+      be obtained recursively.
+    - echo (bool) = False: If `True`, commands and responses executed in
+      subprocesses will be printed to `sys.stdout`
+    - depth (int|None) = None: The maximum depth of recursion to follow
+      requirements. If `None` (the default), recursion is not restricted.
+    """
+    if isinstance(exclude, str):
+        exclude = (exclude,)
+    return iter_distinct(
         _iter_requirement_names(
             get_requirement(requirement_string),
-            exclude=exclude,
+            exclude=set(map(normalize_name, exclude)),
+            recursive=recursive,
+            echo=echo,
+            depth=depth,
+        )
+    )
+
+
+@functools.lru_cache
+def _get_required_distribution_names(
+    requirement_string: str,
+    *,
+    exclude: frozenset[str],
+    recursive: bool,
+    echo: bool,
+    depth: int | None,
+) -> frozenset[str]:
+    return frozenset(
+        _iter_requirement_names(
+            get_requirement(requirement_string),
+            exclude=set(exclude),
             recursive=recursive,
             echo=echo,
             depth=depth,
@@ -890,15 +1177,14 @@ def install_requirement(requirement: str | Requirement) -> None:
     return _install_requirement(requirement)
 
 
-def _install_requirement_string(
-    requirement_string: str,
-    name: str = "",
+def _get_install_command(
+    requirement_strings: Iterable[str],
     *,
     editable: bool = False,
-) -> None:
+) -> tuple[str, ...]:
     """
-    Install a requirement string with no dependencies, compilation, build
-    isolation, etc.
+    Get a command to install one or more requirement strings with no
+    dependencies, compilation, build isolation, etc.
     """
     command: tuple[str, ...] = (
         sys.executable,
@@ -908,13 +1194,28 @@ def _install_requirement_string(
         "--no-deps",
         "--no-compile",
     )
-    if editable:
-        command += (
-            "-e",
-            requirement_string,
-        )
-    else:
-        command += (requirement_string,)
+    requirement_string: str
+    for requirement_string in requirement_strings:
+        if editable:
+            command += ("-e", requirement_string)
+        else:
+            command += (requirement_string,)
+    return command
+
+
+def _install_requirement_string(
+    requirement_string: str,
+    name: str = "",
+    *,
+    editable: bool = False,
+) -> None:
+    """
+    Install a requirement string with no dependencies, compilation, build
+    isolation, etc.
+    """
+    command: tuple[str, ...] = _get_install_command(
+        (requirement_string,), editable=editable
+    )
     try:
         check_output(command)
     except CalledProcessError as error:
@@ -952,15 +1253,15 @@ def _install_requirement(
 ) -> None:
     requirement_string: str = str(requirement)
     # Get the distribution name
-    distribution: Distribution | None = None
+    distribution: Distribution | None = get_installed_distributions().get(
+        normalize_name(requirement.name)
+    )
     editable_location: str = ""
-    try:
-        distribution = _get_distribution(requirement.name)
-        editable_location = get_editable_distribution_location(
-            distribution.metadata["Name"]
-        )
-    except (PackageNotFoundError, KeyError):
-        pass
+    if distribution is not None:
+        with suppress(KeyError):
+            editable_location = get_editable_distribution_location(
+                _get_distribution_name(distribution)
+            )
     # If the requirement is installed and editable, re-install from
     # the editable location
     if distribution and editable_location:
@@ -1006,6 +1307,58 @@ def _get_requirement_distribution(
         )
 
 
+def _install_missing_requirements(
+    requirements: Iterable[Requirement],
+    *,
+    echo: bool = False,
+) -> None:
+    """
+    Install any of the specified requirements which are not yet installed
+    using a single `pip install` command, rather than one command per
+    requirement. If the batched installation fails, nothing is raised:
+    the requirements will be installed individually (and any errors
+    reported for the offending requirement) when they are looked up.
+    """
+    installed: dict[str, Distribution] = get_installed_distributions()
+    missing: dict[str, str] = {}
+    requirement: Requirement
+    for requirement in requirements:
+        name: str = _get_requirement_name(requirement)
+        if (name not in installed) and (
+            name not in _BUILTIN_DISTRIBUTION_NAMES
+        ):
+            missing.setdefault(name, str(requirement))
+    if not missing:
+        return
+    if echo:
+        warn(
+            "The required distributions "
+            f"{', '.join(map(repr, missing))} were not installed, "
+            "attempting to install them now...",
+            stacklevel=2,
+        )
+    try:
+        check_output(_get_install_command(missing.values()))
+    except CalledProcessError:
+        return
+    # Refresh the metadata
+    cache_clear()
+
+
+@functools.lru_cache(maxsize=2048)
+def _marker_matches_extras(marker: str, extras: frozenset[str]) -> bool:
+    """
+    Return `True` if the environment marker `marker` evaluates as `True`
+    for any one of the specified `extras`.
+    """
+    marker_: Marker = Marker(marker)
+    if "extra" not in marker:
+        # The marker does not depend on the extra, so one evaluation
+        # suffices
+        return marker_.evaluate({"extra": next(iter(extras), "")})
+    return any(marker_.evaluate({"extra": extra}) for extra in extras)
+
+
 def _iter_distribution_requirements(
     distribution: Distribution,
     extras: tuple[str, ...] = (),
@@ -1013,13 +1366,14 @@ def _iter_distribution_requirements(
 ) -> Iterable[Requirement]:
     if not distribution.requires:
         return
+    extras_set: frozenset[str] = frozenset(extras)
     requirement: Requirement
     for requirement in map(Requirement, distribution.requires):
         if (
             (requirement.marker is None)
-            or any(
-                requirement.marker.evaluate({"extra": extra})
-                for extra in extras
+            or (
+                extras_set
+                and _marker_matches_extras(str(requirement.marker), extras_set)
             )
         ) and (normalize_name(requirement.name) not in exclude):
             yield requirement
@@ -1028,7 +1382,7 @@ def _iter_distribution_requirements(
 def _iter_requirement_names(
     requirement: Requirement,
     *,
-    exclude: MutableSet[str],
+    exclude: set[str],
     recursive: bool = True,
     echo: bool = False,
     depth: int | None = None,
@@ -1054,26 +1408,43 @@ def _iter_requirement_names(
             ),
         )
     )
-    lateral_exclude: MutableSet[str] = set()
+    if recursive and ((depth is None) or depth >= 1):
+        # Install any missing requirements for this level of recursion
+        # in one batch
+        _install_missing_requirements(
+            (
+                requirement_
+                for requirement_ in requirements
+                if _get_requirement_name(requirement_) not in exclude
+            ),
+            echo=echo,
+        )
+    lateral_exclude: set[str] = set()
 
     def iter_requirement_names_(
         requirement_: Requirement,
         depth_: int | None = None,
     ) -> Iterable[str]:
         if (depth_ is None) or depth_ >= 0:
-            yield from _iter_requirement_names(
-                requirement_,
-                exclude=cast(
-                    MutableSet[str],
-                    exclude
-                    | (
-                        lateral_exclude - {_get_requirement_name(requirement_)}
-                    ),
-                ),
-                recursive=recursive,
-                echo=echo,
-                depth=None if (depth_ is None) else depth_ - 1,
-            )
+            name_: str = _get_requirement_name(requirement_)
+            # Temporarily extend the (shared) exclusions with this
+            # requirement's siblings, and rewind them once its
+            # requirements have been traversed
+            added: set[str] = (lateral_exclude - {name_}) - exclude
+            exclude.update(added)
+            if name_ not in exclude:
+                # `_iter_requirement_names` will exclude `name_` itself
+                added.add(name_)
+            try:
+                yield from _iter_requirement_names(
+                    requirement_,
+                    exclude=exclude,
+                    recursive=recursive,
+                    echo=echo,
+                    depth=None if (depth_ is None) else depth_ - 1,
+                )
+            finally:
+                exclude.difference_update(added)
 
     def not_excluded(name: str) -> bool:
         if name not in exclude:
@@ -1089,7 +1460,7 @@ def _iter_requirement_names(
         requirement_: Requirement
         requirement_names = chain(
             requirement_names,
-            *(
+            chain.from_iterable(
                 iter_requirement_names_(
                     requirement_, None if (depth is None) else depth - 1
                 )
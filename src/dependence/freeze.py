@@ -1,22 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import heapq
+import os
+import re
 from collections.abc import Iterable, MutableSet
-from fnmatch import fnmatch
+from collections.abc import Set as AbstractSet
+from fnmatch import translate
 from functools import partial
 from importlib.metadata import Distribution
 from importlib.metadata import distribution as _get_distribution
 from itertools import chain
-from typing import cast
+from typing import Callable
 
 from dependence._utilities import (
     get_distribution,
+    get_distribution_name_version,
     get_required_distribution_names,
     get_requirement_string_distribution_name,
     install_requirement,
     is_configuration_file,
     iter_configuration_file_requirement_strings,
-    iter_distinct,
     iter_parse_delimited_values,
     normalize_name,
 )
@@ -30,6 +34,12 @@ _DO_NOT_PIN_DISTRIBUTION_NAMES: MutableSet[str] = {
 def _iter_sort_dependents_last(requirements: Iterable[str]) -> Iterable[str]:
     """
     Sort requirements such that dependents are first and dependencies are last.
+
+    Requirements are yielded in alphabetical (case-insensitive) passes over
+    those remaining, each pass yielding every requirement which has no
+    outstanding dependencies at the point it is reached. Interdependent
+    distributions (circular references) are treated as having no
+    relationship.
     """
     requirements = list(requirements)
     distribution_name: str
@@ -41,37 +51,73 @@ def _iter_sort_dependents_last(requirements: Iterable[str]) -> Iterable[str]:
         distribution_name: get_required_distribution_names(requirement)
         for distribution_name, requirement in distribution_requirement.items()
     }
-    while dependent_dependencies:
-        dependent: str
-        dependencies: MutableSet[str]
-        item: tuple[str, MutableSet[str]]
-        for dependent, dependencies in sorted(  # noqa: C414
-            tuple(dependent_dependencies.items()),
-            key=lambda item: item[0].lower(),
-        ):
-
-            def is_non_circular_requirement(
-                dependency: str,
-                dependent: str,
-            ) -> bool:
-                """
-                Return `True` if the dependency is still among the unaccounted
-                for requirements, and is not a circular reference
-                """
-                return (dependency in dependent_dependencies) and (
-                    # Exclude interdependent distributions
-                    # (circular references)
-                    dependent not in dependent_dependencies[dependency]
-                )
-
-            if (not dependencies) or not any(
-                map(
-                    partial(is_non_circular_requirement, dependent=dependent),
-                    dependencies,
-                )
+    # Map each dependency to the distributions which depend on it, and count
+    # the number of outstanding dependencies for each dependent, considering
+    # only non-circular references among the distributions being sorted
+    dependency_dependents: dict[str, list[str]] = {
+        distribution_name: [] for distribution_name in dependent_dependencies
+    }
+    dependency_count: dict[str, int] = dict.fromkeys(dependent_dependencies, 0)
+    dependent: str
+    dependencies: MutableSet[str]
+    dependency: str
+    for dependent, dependencies in dependent_dependencies.items():
+        for dependency in dependencies:
+            if (dependency in dependent_dependencies) and (
+                dependent not in dependent_dependencies[dependency]
             ):
-                yield distribution_requirement.pop(dependent)
-                del dependent_dependencies[dependent]
+                dependency_dependents[dependency].append(dependent)
+                dependency_count[dependent] += 1
+    # Distributions with no outstanding dependencies are ready to be yielded
+    ready: list[tuple[str, str]] = [
+        (distribution_name.lower(), distribution_name)
+        for distribution_name, count in dependency_count.items()
+        if not count
+    ]
+    heapq.heapify(ready)
+    # Distributions which become ready, but sort before the distribution
+    # which freed them, must wait for the next alphabetical pass
+    deferred: list[tuple[str, str]] = []
+    item: tuple[str, str]
+    while ready:
+        item = heapq.heappop(ready)
+        distribution_name = item[1]
+        yield distribution_requirement.pop(distribution_name)
+        for dependent in dependency_dependents[distribution_name]:
+            dependency_count[dependent] -= 1
+            if not dependency_count[dependent]:
+                if (dependent.lower(), dependent) > item:
+                    heapq.heappush(ready, (dependent.lower(), dependent))
+                else:
+                    deferred.append((dependent.lower(), dependent))
+        if deferred and not ready:
+            ready = deferred
+            heapq.heapify(ready)
+            deferred = []
+    # This should not occur, since non-circular references form an acyclic
+    # graph, but if it does, yield any remaining requirements alphabetically
+    for distribution_name in sorted(
+        distribution_requirement, key=lambda name: name.lower()
+    ):
+        yield distribution_requirement[distribution_name]
+
+
+def _split_requirement_files(
+    requirements: Iterable[str],
+) -> tuple[list[str], list[str]]:
+    """
+    Separate (distinct) requirement files from requirement strings, in a
+    single pass, returning a tuple of both lists.
+    """
+    requirement_files: list[str] = []
+    requirement_strings: list[str] = []
+    requirement: str
+    for requirement in dict.fromkeys(requirements):
+        if is_configuration_file(requirement):
+            requirement_files.append(requirement)
+        else:
+            requirement_strings.append(requirement)
+    return requirement_files, requirement_strings
 
 
 def get_frozen_requirements(
@@ -109,31 +155,36 @@ def get_frozen_requirements(
         exclude_pointers: A tuple of JSON pointers indicating elements to
             exclude (defaults to no exclusions). Only applies to TOML files.
     """
-    # Separate requirement strings from requirement files
     if isinstance(requirements, str):
-        requirements = {requirements}
-    else:
-        requirements = set(requirements)
+        requirements = (requirements,)
     if isinstance(no_version, str):
         no_version = (no_version,)
     elif not isinstance(no_version, tuple):
         no_version = tuple(no_version)
-    requirement_files: MutableSet[str] = set(
-        filter(is_configuration_file, requirements)
-    )
-    requirement_strings: MutableSet[str] = cast(
-        MutableSet[str], requirements - requirement_files
+    # Normalize excluded distribution names
+    if isinstance(exclude, str):
+        exclude = (exclude,)
+    if isinstance(exclude_recursive, str):
+        exclude_recursive = (exclude_recursive,)
+    exclude = frozenset(map(normalize_name, exclude))
+    exclude_recursive = frozenset(map(normalize_name, exclude_recursive))
+    requirement_files: list[str]
+    requirement_strings: list[str]
+    requirement_files, requirement_strings = _split_requirement_files(
+        requirements
     )
-    frozen_requirements: Iterable[str] = iter_distinct(
+    frozen_requirements: Iterable[str] = dict.fromkeys(
         chain(
             requirement_strings,
-            *map(
-                partial(
-                    iter_configuration_file_requirement_strings,
-                    include_pointers=include_pointers,
-                    exclude_pointers=exclude_pointers,
-                ),
-                requirement_files,
+            chain.from_iterable(
+                map(
+                    partial(
+                        iter_configuration_file_requirement_strings,
+                        include_pointers=include_pointers,
+                        exclude_pointers=exclude_pointers,
+                    ),
+                    requirement_files,
+                )
             ),
         )
     )
@@ -142,34 +193,20 @@ def get_frozen_requirements(
     if (depth is None) or depth >= 0:
         frozen_requirements = _iter_frozen_requirements(
             frozen_requirements,
-            exclude=set(
-                chain(
-                    # Exclude requirement strings which are *not*
-                    # distribution names (such as editable package paths),
-                    # as in these cases we are typically looking for this
-                    # package's dependencies
-                    (
-                        set(
-                            map(
-                                get_requirement_string_distribution_name,
-                                requirement_strings,
-                            )
-                        )
-                        - set(map(normalize_name, requirement_strings))
-                    ),
-                    map(normalize_name, exclude),
-                )
+            exclude=_get_frozen_requirements_exclude(
+                requirement_strings, exclude
             ),
-            exclude_recursive=set(map(normalize_name, exclude_recursive)),
+            exclude_recursive=exclude_recursive,
             no_version=no_version,
             depth=depth,
         )
     if dependency_order:
-        frozen_requirements = tuple(
+        sorted_requirements: list[str] = list(
             _iter_sort_dependents_last(frozen_requirements)
         )
         if not reverse:
-            frozen_requirements = tuple(reversed(frozen_requirements))
+            sorted_requirements.reverse()
+        frozen_requirements = tuple(sorted_requirements)
     else:
         name: str
         frozen_requirements = tuple(
@@ -182,20 +219,85 @@ def get_frozen_requirements(
     return frozen_requirements
 
 
+def _is_glob_pattern(pattern: str) -> bool:
+    return any(character in pattern for character in "*?[")
+
+
+def _get_pattern_matcher(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """
+    Return a function which determines if a name matches any of the
+    specified glob patterns (as with `fnmatch.fnmatch`). Patterns without
+    wildcards are matched using a set lookup, and the remaining patterns are
+    compiled into a single regular expression, rather than being
+    matched individually.
+    """
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+    patterns = tuple(map(os.path.normcase, patterns))
+    names: frozenset[str] = frozenset(
+        pattern for pattern in patterns if not _is_glob_pattern(pattern)
+    )
+    glob_patterns: tuple[str, ...] = tuple(filter(_is_glob_pattern, patterns))
+    if not glob_patterns:
+        return lambda name: os.path.normcase(name) in names
+    glob_pattern: re.Pattern = re.compile(
+        "|".join(map(translate, glob_patterns))
+    )
+
+    def matches(name: str) -> bool:
+        name = os.path.normcase(name)
+        return (name in names) or (glob_pattern.match(name) is not None)
+
+    return matches
+
+
+def _get_frozen_requirements_exclude(
+    requirement_strings: Iterable[str], exclude: AbstractSet[str]
+) -> AbstractSet[str]:
+    """
+    Get the (normalized) names of distributions to exclude from frozen
+    requirements.
+
+    In addition to those explicitly excluded (`exclude` should contain
+    normalized names), requirement strings which are
+    *not* distribution names (such as editable package paths) are excluded,
+    as in these cases we are typically looking for this package's
+    dependencies.
+    """
+    exclude_names: MutableSet[str] = set(exclude)
+    requirement_string_names: MutableSet[str] = set()
+    distribution_names: MutableSet[str] = set()
+    requirement_string: str
+    for requirement_string in requirement_strings:
+        name: str = normalize_name(requirement_string)
+        distribution_name: str = get_requirement_string_distribution_name(
+            requirement_string
+        )
+        requirement_string_names.add(name)
+        if distribution_name != name:
+            distribution_names.add(distribution_name)
+    exclude_names |= distribution_names - requirement_string_names
+    return exclude_names
+
+
 def _iter_frozen_requirements(
     requirement_strings: Iterable[str],
-    exclude: MutableSet[str],
-    exclude_recursive: MutableSet[str],
-    no_version: Iterable[str] = (),
+    exclude: AbstractSet[str],
+    exclude_recursive: AbstractSet[str],
+    no_version: tuple[str, ...] = (),
     depth: int | None = None,
 ) -> Iterable[str]:
-    def get_requirement_string(distribution_name: str) -> str:
-        def distribution_name_matches_pattern(pattern: str) -> bool:
-            return fnmatch(distribution_name, pattern)
+    """
+    Yield frozen requirement strings for the distributions required by
+    `requirement_strings`. The names in `exclude` and `exclude_recursive`
+    should already be normalized.
+    """
+    is_no_version: Callable[[str], bool] = _get_pattern_matcher(
+        chain(_DO_NOT_PIN_DISTRIBUTION_NAMES, no_version)
+    )
 
-        if (distribution_name in _DO_NOT_PIN_DISTRIBUTION_NAMES) or any(
-            map(distribution_name_matches_pattern, no_version)
-        ):
+    def get_requirement_string(distribution_name: str) -> str:
+        if is_no_version(distribution_name):
             return distribution_name
         distribution: Distribution
         try:
@@ -204,7 +306,10 @@ def _iter_frozen_requirements(
             # If the distribution is missing, install it
             install_requirement(distribution_name)
             distribution = _get_distribution(distribution_name)
-        return f"{distribution.metadata['Name']}=={distribution.version}"
+        name: str
+        version: str
+        name, version = get_distribution_name_version(distribution)
+        return f"{name}=={version}"
 
     def get_required_distribution_names_(
         requirement_string: str,
@@ -222,20 +327,18 @@ def _iter_frozen_requirements(
                 exclude=exclude_recursive,
                 depth=None if (depth_ is None) else depth_ - 1,
             )
-        return cast(
-            MutableSet[str],
-            distribution_names - exclude,
-        )
+        # Remove exclusions in-place, since this set is not shared
+        if exclude:
+            distribution_names -= exclude
+        return distribution_names
 
     requirement_string: str
-    requirements: Iterable[str] = iter_distinct(
-        chain(
-            *(
-                get_required_distribution_names_(
-                    requirement_string, None if (depth is None) else depth - 1
-                )
-                for requirement_string in requirement_strings
+    requirements: Iterable[str] = dict.fromkeys(
+        chain.from_iterable(
+            get_required_distribution_names_(
+                requirement_string, None if (depth is None) else depth - 1
             )
+            for requirement_string in requirement_strings
         ),
     )
     return map(get_requirement_string, requirements)
@@ -277,21 +380,19 @@ def freeze(
         exclude_pointers: If not empty, these TOML tables will *not* be
             inspected (for pyproject.toml files)
     """
-    print(  # noqa: T201
-        "\n".join(
-            get_frozen_requirements(
-                requirements=requirements,
-                exclude=exclude,
-                exclude_recursive=exclude_recursive,
-                no_version=no_version,
-                dependency_order=dependency_order,
-                reverse=reverse,
-                depth=depth,
-                include_pointers=include_pointers,
-                exclude_pointers=exclude_pointers,
-            )
-        )
-    )
+    requirement: str
+    for requirement in get_frozen_requirements(
+        requirements=requirements,
+        exclude=exclude,
+        exclude_recursive=exclude_recursive,
+        no_version=no_version,
+        dependency_order=dependency_order,
+        reverse=reverse,
+        depth=depth,
+        include_pointers=include_pointers,
+        exclude_pointers=exclude_pointers,
+    ):
+        print(requirement)  # noqa: T201
 
 
 def main() -> None:
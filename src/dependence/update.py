@@ -364,14 +364,12 @@ def _get_updated_pyproject_toml(
         dependencies: list[str]
         project_optional_dependencies[all_extra_name] = list(
             iter_distinct(
-                chain(
-                    *(
-                        dependencies
-                        for key, dependencies in (
-                            project_optional_dependencies.items()
-                        )
-                        if key != all_extra_name
+                chain.from_iterable(
+                    dependencies
+                    for key, dependencies in (
+                        project_optional_dependencies.items()
                     )
+                    if key != all_extra_name
                 )
             )
         )
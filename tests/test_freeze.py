@@ -6,6 +6,8 @@ import pytest
 from dependence._utilities import (
     get_required_distribution_names,
     get_requirement_string_distribution_name,
+    iter_configuration_file_requirement_strings,
+    iter_required_distribution_names,
 )
 from dependence.freeze import get_frozen_requirements
 
@@ -67,6 +69,87 @@ def test_freeze_order() -> None:
         raise RuntimeError("\n".join(error_messages))
 
 
+def test_freeze_order_reverse() -> None:
+    """
+    Verify that reversing the dependency order of frozen requirements yields
+    the same requirements, in the opposite order
+    """
+    frozen_requirements: tuple[str, ...] = get_frozen_requirements(
+        requirements=REQUIREMENTS_A, dependency_order=True
+    )
+    assert frozen_requirements
+    assert (
+        get_frozen_requirements(
+            requirements=REQUIREMENTS_A, dependency_order=True, reverse=True
+        )
+        == frozen_requirements[::-1]
+    )
+
+
+def test_freeze_no_version_pattern() -> None:
+    """
+    Verify that versions are omitted for distributions matching a
+    `no_version` glob pattern
+    """
+    frozen_requirements: tuple[str, ...] = get_frozen_requirements(
+        requirements=REQUIREMENTS_A, no_version=("p*", "[rs]*")
+    )
+    assert frozen_requirements
+    requirement: str
+    for requirement in frozen_requirements:
+        if requirement.startswith(("p", "r", "s")):
+            assert "==" not in requirement, requirement
+        else:
+            assert "==" in requirement, requirement
+
+
+def test_freeze_no_version_name() -> None:
+    """
+    Verify that versions are omitted for distributions named in `no_version`
+    """
+    frozen_requirements: tuple[str, ...] = get_frozen_requirements(
+        requirements=REQUIREMENTS_A, no_version=("pip", "setuptools")
+    )
+    assert "pip" in frozen_requirements
+    assert "setuptools" in frozen_requirements
+    requirement: str
+    for requirement in frozen_requirements:
+        if requirement not in ("pip", "setuptools"):
+            assert "==" in requirement, requirement
+
+
+def test_iter_required_distribution_names() -> None:
+    """
+    Verify that streamed required distribution names are distinct, and
+    match those returned by `get_required_distribution_names`
+    """
+    names: tuple[str, ...] = tuple(iter_required_distribution_names("pip"))
+    assert len(names) == len(set(names))
+    assert set(names) == get_required_distribution_names("pip")
+    names = tuple(iter_required_distribution_names("dependence"))
+    assert names
+    assert len(names) == len(set(names))
+    assert set(names) == get_required_distribution_names("dependence")
+
+
+def test_iter_requirements_txt_requirement_strings() -> None:
+    """
+    Verify that comments, blank lines and options (such as "-r" and "-c")
+    are skipped when reading a requirements file
+    """
+    assert tuple(
+        iter_configuration_file_requirement_strings(
+            str(TEST_PROJECT_A.joinpath("requirements-options.txt"))
+        )
+    ) == (
+        "mypy>=0.0.0",
+        "flake8>=0.0.0",
+        'pytest~=0.0 ; python_version >= "3.9"',
+        "black[jupyter]>=0.0.0",
+        "pip",
+    )
+
+
 def test_freeze_cli() -> None:
     pass
 